@@ -4,28 +4,120 @@ Audio Generator
 Handles text-to-speech conversion using OpenAI TTS or ElevenLabs.
 """
 
+import atexit
+import base64
+import math
 import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterator, Optional
 
+import httpx
+import numpy as np
+import orjson
 from openai import OpenAI
 
+# Stream audio to disk in large chunks to keep write() syscalls low
+CHUNK_SIZE = 64 * 1024
+WRITE_BUFFER_SIZE = 256 * 1024
+
+# PCM sample width in bytes -> NumPy dtype (pydub stores 8-bit audio as signed)
+SAMPLE_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+ELEVENLABS_STREAM_URL = "wss://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream-input?model_id={model_id}"
+
+# Process-wide clients, shared across orchestrator runs so SDK setup and warm
+# HTTP/2 connections are reused; the pool is closed at interpreter exit
+_http_client: Optional[httpx.Client] = None
+_openai_client: Optional[OpenAI] = None
+
+
+def get_http_client() -> httpx.Client:
+    """Return the shared HTTP/2 keep-alive pool, creating it on first use."""
+    global _http_client
+
+    if _http_client is None:
+        _http_client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=16, keepalive_expiry=60),
+            timeout=httpx.Timeout(60.0)
+        )
+        atexit.register(_http_client.close)
+
+    return _http_client
+
+
+def get_openai_client() -> OpenAI:
+    """Return the shared OpenAI client, built on the shared HTTP pool."""
+    global _openai_client
+
+    if _openai_client is None:
+        _openai_client = OpenAI(http_client=get_http_client())
+
+    return _openai_client
+
+
+@dataclass(frozen=True, slots=True)
+class VoiceConfig:
+    """Resolved settings for one speaker voice."""
+
+    voice_id: str
+    speed: float = 1.0
+    model: str = 'tts-1'
+
+
+def build_voice_configs(config: Dict, tts_model: Optional[str] = None) -> Dict[str, VoiceConfig]:
+    """
+    Parse the audio voices section of the configuration once.
+
+    Args:
+        config: Configuration dictionary
+        tts_model: Model that overrides every configured TTS model (e.g. from --hd)
+
+    Returns:
+        Mapping of voice identifier -> VoiceConfig
+    """
+    audio_config = config['audio']
+
+    # audio.model, then the older models.tts key, then tts-1 for speed
+    default_model = audio_config.get('model', config.get('models', {}).get('tts', 'tts-1'))
+
+    return {
+        name: VoiceConfig(
+            voice_id=voice['voice_id'],
+            speed=float(voice.get('speed', 1.0)),
+            # Explicit override, then per-voice model, then the default
+            model=tts_model or voice.get('model', default_model)
+        )
+        for name, voice in audio_config['voices'].items()
+    }
+
 
 class AudioGenerator:
     """Generates audio from text using TTS APIs."""
 
-    def __init__(self, config: Dict):
+    def __init__(
+        self,
+        config: Dict,
+        tts_model: Optional[str] = None
+    ):
         """
         Initialize the audio generator.
 
         Args:
             config: Configuration dictionary
+            tts_model: Override for all configured TTS models
         """
         self.config = config
+        self.voices = build_voice_configs(config, tts_model)
         self.tts_provider = os.getenv('TTS_PROVIDER', 'openai')
 
         if self.tts_provider == 'openai':
-            self.client = OpenAI()
+            self.client = get_openai_client()
         elif self.tts_provider == 'elevenlabs':
             try:
                 from elevenlabs import generate, set_api_key
@@ -58,75 +150,196 @@ class AudioGenerator:
         else:
             raise ValueError(f"Unsupported TTS provider: {self.tts_provider}")
 
+    @property
+    def supports_text_streaming(self) -> bool:
+        """Whether audio can start before the full text is available."""
+        return self.tts_provider == 'elevenlabs'
+
+    def text_to_speech_stream(
+        self,
+        text_chunks: Iterator[str],
+        output_path: str,
+        voice: str = 'proposition'
+    ) -> str:
+        """
+        Convert incrementally produced text to speech and save as audio file.
+
+        Args:
+            text_chunks: Iterator of text fragments (e.g. LLM tokens)
+            output_path: Path to save the audio file
+            voice: Voice identifier ('proposition' or 'opposition')
+
+        Returns:
+            The full text that was converted
+        """
+        if self.tts_provider == 'elevenlabs':
+            return self._elevenlabs_tts_stream(text_chunks, output_path, voice)
+
+        # Other providers need the complete text before synthesis
+        text = ''.join(text_chunks)
+        self.text_to_speech(text, output_path, voice)
+        return text
+
     def _openai_tts(self, text: str, output_path: str, voice: str) -> str:
         """Generate audio using OpenAI TTS with latest model."""
 
-        # Get voice configuration
-        voice_config = self.config['audio']['voices'][voice]
-        voice_id = voice_config['voice_id']
-        speed = voice_config.get('speed', 1.0)
-
-        # Get TTS model from config (defaults to tts-1-hd)
-        tts_model = self.config.get('models', {}).get('tts', 'tts-1-hd')
+        voice_config = self.voices[voice]
 
-        # Generate audio
-        response = self.client.audio.speech.create(
-            model=tts_model,  # Use configured model (tts-1-hd for high quality)
-            voice=voice_id,
+        # Generate audio, writing bytes to disk as they arrive
+        with self.client.audio.speech.with_streaming_response.create(
+            model=voice_config.model,  # Use configured model (tts-1-hd for high quality)
+            voice=voice_config.voice_id,
             input=text,
-            speed=speed
-        )
-
-        # Save to file
-        response.stream_to_file(output_path)
+            speed=voice_config.speed
+        ) as response:
+            with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                for chunk in response.iter_bytes(CHUNK_SIZE):
+                    f.write(chunk)
 
         return output_path
 
     def _elevenlabs_tts(self, text: str, output_path: str, voice: str) -> str:
         """Generate audio using ElevenLabs."""
 
-        # Get voice configuration
-        voice_config = self.config['audio']['voices'][voice]
-        voice_id = voice_config['voice_id']
-
-        # Generate audio
-        audio = self.elevenlabs_generate(
+        # Generate audio as a stream of chunks rather than one bytes object
+        audio_stream = self.elevenlabs_generate(
             text=text,
-            voice=voice_id,
-            model="eleven_monolingual_v1"
+            voice=self.voices[voice].voice_id,
+            model="eleven_monolingual_v1",
+            stream=True
         )
 
-        # Save to file
-        with open(output_path, 'wb') as f:
-            f.write(audio)
+        # Save to file as chunks arrive
+        with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            for chunk in audio_stream:
+                if chunk:
+                    f.write(chunk)
 
         return output_path
 
+    def _elevenlabs_tts_stream(self, text_chunks: Iterator[str], output_path: str, voice: str) -> str:
+        """Generate audio with the ElevenLabs stream-input websocket as text arrives."""
+        try:
+            from websockets.sync.client import connect
+        except ImportError:
+            raise ImportError("websockets not installed. Run: pip install websockets")
+
+        url = ELEVENLABS_STREAM_URL.format(
+            voice_id=self.voices[voice].voice_id,
+            model_id="eleven_monolingual_v1"
+        )
+
+        parts = []
+
+        with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f, \
+                ThreadPoolExecutor(max_workers=1) as executor, \
+                connect(url) as websocket:
+
+            # Write audio as it comes back while text is still being sent
+            def receive() -> None:
+                for message in websocket:
+                    data = orjson.loads(message)
+                    if data.get('audio'):
+                        f.write(base64.b64decode(data['audio']))
+                    if data.get('isFinal'):
+                        break
+
+            receiver = executor.submit(receive)
+
+            websocket.send(orjson.dumps({
+                'text': ' ',
+                'xi_api_key': os.getenv('ELEVENLABS_API_KEY'),
+            }).decode())
+
+            for chunk in text_chunks:
+                if chunk:
+                    parts.append(chunk)
+                    websocket.send(orjson.dumps({
+                        'text': chunk,
+                        'try_trigger_generation': True,
+                    }).decode())
+
+            # An empty text message flushes remaining audio and ends the stream
+            websocket.send(orjson.dumps({'text': ''}).decode())
+            receiver.result()
+
+        return ''.join(parts)
+
     def normalize_audio(self, audio_path: str) -> str:
         """
         Normalize audio levels (optional post-processing).
 
+        Uses ffmpeg's loudnorm filter (EBU R128) when ffmpeg is on PATH.
+        Otherwise falls back to pydub peak normalization, which still needs
+        a decoder pydub can find (e.g. avconv) to read MP3; if it has none,
+        the file is left unchanged.
+
         Args:
             audio_path: Path to audio file
 
         Returns:
             Path to normalized audio file
         """
+        if shutil.which('ffmpeg'):
+            return self._ffmpeg_normalize(audio_path)
+
         try:
             from pydub import AudioSegment
-            from pydub.effects import normalize
+            from pydub.exceptions import CouldntDecodeError
+        except ImportError:
+            # If pydub not available, skip normalization
+            return audio_path
 
-            # Load audio
+        # Load audio
+        try:
             audio = AudioSegment.from_file(audio_path)
+        except (FileNotFoundError, CouldntDecodeError):
+            # No usable decoder for this file, skip normalization
+            return audio_path
 
-            # Normalize
-            normalized_audio = normalize(audio)
-
-            # Save
-            normalized_audio.export(audio_path, format='mp3')
+        # Find the peak with one vectorized pass instead of pydub's sample loop;
+        # negate the minimum as a Python int so the most negative sample can't overflow
+        samples = np.frombuffer(audio.raw_data, dtype=SAMPLE_DTYPES[audio.sample_width])
+        peak = max(int(samples.max()), -int(samples.min())) if samples.size else 0
 
+        if peak == 0:
+            # Silent audio has nothing to normalize
             return audio_path
 
-        except ImportError:
-            # If pydub not available, skip normalization
-            return audio_path
+        # Normalize to just below full scale (matches pydub's 0.1 dB headroom)
+        target = 2 ** (8 * audio.sample_width - 1) - 1
+        gain_db = 20 * math.log10(target / peak)
+        normalized_audio = audio.apply_gain(gain_db - 0.1)
+
+        # Save
+        normalized_audio.export(audio_path, format='mp3')
+
+        return audio_path
+
+    def _ffmpeg_normalize(self, audio_path: str) -> str:
+        """Normalize loudness in place with ffmpeg's loudnorm filter."""
+
+        # Write to a temporary file in the same directory, then atomically replace
+        fd, tmp_path = tempfile.mkstemp(suffix='.mp3', dir=os.path.dirname(audio_path) or '.')
+        os.close(fd)
+
+        try:
+            subprocess.run(
+                [
+                    'ffmpeg', '-y', '-loglevel', 'error',
+                    '-i', audio_path,
+                    '-af', 'loudnorm=I=-16:TP=-1.5:LRA=11',
+                    '-c:a', 'libmp3lame', '-q:a', '2',
+                    tmp_path,
+                ],
+                check=True
+            )
+            os.replace(tmp_path, audio_path)
+        except (subprocess.CalledProcessError, OSError):
+            # Keep the original audio if ffmpeg fails, as the pydub fallback does
+            pass
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        return audio_path
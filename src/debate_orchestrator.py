@@ -4,19 +4,65 @@ Debate Orchestrator
 Coordinates the flow of the Oxford debate, managing agents and state.
 """
 
-import json
+import copy
+import functools
+import hashlib
 import os
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
+import jinja2
+import orjson
 import yaml
+from diskcache import Cache
 from langchain_openai import ChatOpenAI
 
+from audio_generator import AudioGenerator, get_http_client, get_openai_client
+from semantic_cache import SemanticDebateCache
+
+# Prefer the libyaml C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Speaking order: (stage, side, stage name, position)
+SPEECH_ORDER = [
+    ('proposition_opening', 'proposition', 'opening', 1),
+    ('opposition_opening', 'opposition', 'opening', 2),
+    ('proposition_rebuttal', 'proposition', 'rebuttal', 3),
+    ('opposition_rebuttal', 'opposition', 'rebuttal', 4),
+    ('proposition_closing', 'proposition', 'closing', 5),
+    ('opposition_closing', 'opposition', 'closing', 6),
+]
+
+
+@functools.lru_cache(maxsize=4)
+def _load_yaml(path: str, mtime: float) -> Dict:
+    """Parse a YAML file; cached per (path, mtime) so edits are picked up."""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def load_yaml(path: str) -> Dict:
+    """Load a YAML file, reusing the parsed result while the file is unchanged."""
+    # Copy so callers can mutate their config without touching the cache
+    return copy.deepcopy(_load_yaml(path, os.path.getmtime(path)))
+
 
 class DebateOrchestrator:
     """Orchestrates the Oxford-style debate flow."""
 
-    def __init__(self, motion: str, config_path: str = "config/config.yaml", output_dir: str = "output"):
+    def __init__(
+        self,
+        motion: str,
+        config_path: str = "config/config.yaml",
+        output_dir: str = "output",
+        use_cache: bool = True,
+        tts_model: Optional[str] = None
+    ):
         """
         Initialize the debate orchestrator.
 
@@ -24,6 +70,8 @@ class DebateOrchestrator:
             motion: The debate motion
             config_path: Path to configuration file
             output_dir: Directory for output files
+            use_cache: Whether to reuse cached LLM responses and debates
+            tts_model: Override for the configured TTS model
         """
         self.motion = motion
         self.output_dir = Path(output_dir)
@@ -33,21 +81,67 @@ class DebateOrchestrator:
         self._load_api_key()
 
         # Load configuration
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_yaml(config_path)
 
         # Load prompts
-        with open('config/prompts.yaml', 'r') as f:
-            self.prompts = yaml.safe_load(f)
+        self.prompts = load_yaml('config/prompts.yaml')
 
-        # Initialize LLM with latest model
+        # Compile speech templates once; undefined context variables raise
+        template_env = jinja2.Environment(
+            undefined=jinja2.StrictUndefined,
+            keep_trailing_newline=True
+        )
+        self._templates = {
+            stage: template_env.from_string(source)
+            for stage, source in self.prompts['system_prompts'].items()
+        }
+
+        # Initialize LLM with latest model, on the process-wide HTTP/2 pool
+        # shared with TTS and embeddings
         self.llm = ChatOpenAI(
             model=self.config['agents']['proposition']['model'],
-            temperature=self.config['agents']['proposition']['temperature']
+            temperature=self.config['agents']['proposition']['temperature'],
+            http_client=get_http_client()
         )
 
-        # Debate state
+        # Create the TTS client up front so it initializes alongside the LLM
+        self._audio_gen = AudioGenerator(self.config, tts_model=tts_model)
+
+        # Response cache, only for deterministic (temperature 0) generations
+        cache_config = self.config.get('cache', {})
+        self.cache = None
+        if use_cache and self.llm.temperature == 0:
+            self.cache = Cache(cache_config.get('directory', '.cache/llm'))
+
+        # Semantic cache so paraphrased motions reuse a previous debate
+        self.semantic_cache = None
+        if use_cache and cache_config.get('semantic', {}).get('enabled', False):
+            self.semantic_cache = SemanticDebateCache(
+                directory=cache_config['semantic'].get('directory', '.cache/semantic'),
+                threshold=cache_config['semantic'].get('threshold', 0.93),
+                client=get_openai_client(),
+                model=self.llm.model_name,
+                prompts_hash=hashlib.sha256(orjson.dumps(
+                    self.prompts['system_prompts'],
+                    option=orjson.OPT_SORT_KEYS
+                )).hexdigest()
+            )
+
+        # Debate state; debate_motion differs from motion when the content was
+        # reused from a semantic cache hit on a paraphrased motion
         self.debate_content: Dict[str, str] = {}
+        self.debate_motion = motion
+
+    def close(self):
+        """Close the LLM response cache (the shared HTTP pool lives until exit)."""
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _load_api_key(self):
         """Load OpenAI API key from config/secrets/config.json."""
@@ -59,8 +153,7 @@ class DebateOrchestrator:
                 "Please copy your OpenAI config.json to config/secrets/config.json"
             )
 
-        with open(secrets_path, 'r') as f:
-            secrets = json.load(f)
+        secrets = orjson.loads(secrets_path.read_bytes())
 
         # Set API key in environment (supports multiple key formats)
         api_key = secrets.get('OPENAI_API_KEY') or secrets.get('openai_api_key') or secrets.get('API_KEY')
@@ -75,57 +168,100 @@ class DebateOrchestrator:
         if api_base:
             os.environ['OPENAI_API_BASE'] = api_base
 
-    def generate_debate(self) -> Dict[str, str]:
+    def generate_debate(
+        self,
+        on_speech: Optional[Callable[[str, str], None]] = None,
+        speech_fn: Optional[Callable[[str, Dict[str, str]], str]] = None
+    ) -> Dict[str, str]:
         """
         Generate the complete debate content.
 
+        Args:
+            on_speech: Optional callback invoked with (stage, text) as soon as
+                each speech is available
+            speech_fn: Optional replacement for _generate_speech, called with
+                (stage, context) to produce each speech
+
         Returns:
             Dictionary mapping stage to generated text
         """
-        # 1. Generate opening statements
-        self.debate_content['proposition_opening'] = self._generate_speech(
-            'proposition_opening',
-            {}
-        )
+        # Reuse a previous debate if a sufficiently similar motion was seen.
+        # A hit only skips the LLM calls; on_speech still fires for every stage,
+        # so audio is synthesized as usual.
+        embedding = None
+        if self.semantic_cache is not None:
+            embedding = self.semantic_cache.embed(self.motion)
+            cached = self.semantic_cache.lookup(embedding)
+            if cached is not None:
+                self.debate_content = dict(cached['debate_content'])
+                self.debate_motion = cached['motion']
+                if on_speech is not None:
+                    for stage, _, _, _ in SPEECH_ORDER:
+                        on_speech(stage, self.debate_content[stage])
+                return self.debate_content
+
+        # 1. Generate opening statements (independent of each other)
+        self._generate_wave({
+            'proposition_opening': {},
+            'opposition_opening': {},
+        }, on_speech, speech_fn)
+
+        # 2. Generate rebuttals (each depends only on the openings)
+        self._generate_wave({
+            'proposition_rebuttal': {
+                'opposition_opening': self.debate_content['opposition_opening']
+            },
+            'opposition_rebuttal': {
+                'proposition_opening': self.debate_content['proposition_opening']
+            },
+        }, on_speech, speech_fn)
+
+        # 3. Generate closing statements (depend on all prior speeches)
+        # Both sides see the same context, built once
+        closing_context = {
+            'proposition_opening': self.debate_content['proposition_opening'],
+            'opposition_opening': self.debate_content['opposition_opening'],
+            'proposition_rebuttal': self.debate_content['proposition_rebuttal'],
+            'opposition_rebuttal': self.debate_content['opposition_rebuttal'],
+        }
+        self._generate_wave({
+            'proposition_closing': closing_context,
+            'opposition_closing': closing_context,
+        }, on_speech, speech_fn)
+
+        if self.semantic_cache is not None:
+            self.semantic_cache.add(embedding, self.motion, self.debate_content)
 
-        self.debate_content['opposition_opening'] = self._generate_speech(
-            'opposition_opening',
-            {}
-        )
-
-        # 2. Generate rebuttals
-        self.debate_content['proposition_rebuttal'] = self._generate_speech(
-            'proposition_rebuttal',
-            {'opposition_opening': self.debate_content['opposition_opening']}
-        )
+        return self.debate_content
 
-        self.debate_content['opposition_rebuttal'] = self._generate_speech(
-            'opposition_rebuttal',
-            {'proposition_opening': self.debate_content['proposition_opening']}
-        )
+    def _generate_wave(
+        self,
+        stages: Dict[str, Dict[str, str]],
+        on_speech: Optional[Callable[[str, str], None]] = None,
+        speech_fn: Optional[Callable[[str, Dict[str, str]], str]] = None
+    ) -> None:
+        """
+        Generate a set of mutually independent speeches concurrently.
 
-        # 3. Generate closing statements
-        self.debate_content['proposition_closing'] = self._generate_speech(
-            'proposition_closing',
-            {
-                'proposition_opening': self.debate_content['proposition_opening'],
-                'opposition_opening': self.debate_content['opposition_opening'],
-                'proposition_rebuttal': self.debate_content['proposition_rebuttal'],
-                'opposition_rebuttal': self.debate_content['opposition_rebuttal'],
-            }
-        )
+        Args:
+            stages: Mapping of stage -> context for speeches in this wave
+            on_speech: Optional callback invoked with (stage, text) as each
+                speech completes
+            speech_fn: Optional replacement for _generate_speech
+        """
+        speech_fn = speech_fn or self._generate_speech
 
-        self.debate_content['opposition_closing'] = self._generate_speech(
-            'opposition_closing',
-            {
-                'proposition_opening': self.debate_content['proposition_opening'],
-                'opposition_opening': self.debate_content['opposition_opening'],
-                'proposition_rebuttal': self.debate_content['proposition_rebuttal'],
-                'opposition_rebuttal': self.debate_content['opposition_rebuttal'],
+        with ThreadPoolExecutor(max_workers=len(stages)) as executor:
+            futures = {
+                executor.submit(speech_fn, stage, context): stage
+                for stage, context in stages.items()
             }
-        )
 
-        return self.debate_content
+            for future in as_completed(futures):
+                stage = futures[future]
+                self.debate_content[stage] = future.result()
+                if on_speech is not None:
+                    on_speech(stage, self.debate_content[stage])
 
     def _generate_speech(self, stage: str, context: Dict[str, str]) -> str:
         """
@@ -138,71 +274,195 @@ class DebateOrchestrator:
         Returns:
             Generated speech text
         """
-        # Get prompt template
-        prompt_template = self.prompts['system_prompts'][stage]
+        prompt = self._render_prompt(stage, context)
 
-        # Format with motion and context
-        prompt = prompt_template.format(
-            motion=self.motion,
-            **context
-        )
+        key = self._cache_key(prompt)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
 
         # Generate speech
         response = self.llm.invoke(prompt)
+
+        if key is not None:
+            self.cache.set(key, response.content)
+
         return response.content
 
-    def generate_audio(self, debate_content: Dict[str, str]) -> List[str]:
+    def _stream_speech(self, stage: str, context: Dict[str, str]) -> Iterator[str]:
         """
-        Generate audio files from debate content.
+        Generate a speech for a specific stage, yielding text as it is produced.
 
         Args:
-            debate_content: Dictionary of stage -> text
+            stage: The debate stage (e.g., 'proposition_opening')
+            context: Previous speeches for context
+
+        Yields:
+            Fragments of the generated speech text
+        """
+        prompt = self._render_prompt(stage, context)
+
+        key = self._cache_key(prompt)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        chunks = []
+        for chunk in self.llm.stream(prompt):
+            chunks.append(chunk.content)
+            yield chunk.content
+
+        if key is not None:
+            self.cache.set(key, ''.join(chunks))
+
+    def _render_prompt(self, stage: str, context: Dict[str, str]) -> str:
+        """Render the precompiled template for a stage with motion and context."""
+        return self._templates[stage].render(
+            motion=self.motion,
+            **context
+        )
+
+    def _cache_key(self, prompt: str) -> Optional[str]:
+        """Build the response cache key for a prompt, or None if not cacheable."""
+        # The cache is only opened for deterministic (temperature 0) generations
+        if self.cache is None:
+            return None
+
+        return hashlib.sha256(orjson.dumps(
+            {'model': self.llm.model_name, 'temp': self.llm.temperature, 'prompt': prompt},
+            option=orjson.OPT_SORT_KEYS
+        )).hexdigest()
+
+    def generate_debate_with_audio(self) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Generate the debate and its audio, overlapping TTS with generation.
+
+        Each speech is queued for text-to-speech as soon as it is written, so
+        audio for earlier stages is produced while later stages are still
+        being generated. When the TTS provider accepts streamed text, LLM
+        tokens are fed to it directly so audio starts before the speech is
+        finished.
 
         Returns:
-            List of generated audio file paths
+            Tuple of (stage -> text, list of generated audio file paths)
         """
-        from audio_generator import AudioGenerator
+        with ThreadPoolExecutor(max_workers=len(SPEECH_ORDER)) as executor:
+            tts_futures = {}
 
-        audio_gen = AudioGenerator(self.config)
+            def speak_streaming(stage: str, context: Dict[str, str]) -> str:
+                # TTS consumes tokens on the audio executor; this worker returns as
+                # soon as the LLM stream is exhausted so the next wave can start
+                chunks: queue.Queue = queue.Queue()
+                tts_futures[stage] = executor.submit(
+                    self._synthesize_stream, stage, iter(chunks.get, None)
+                )
 
-        audio_files = []
+                parts = []
+                try:
+                    for chunk in self._stream_speech(stage, context):
+                        parts.append(chunk)
+                        chunks.put(chunk)
+                finally:
+                    chunks.put(None)
 
-        # Define order and metadata
-        speech_order = [
-            ('proposition_opening', 'proposition', 'opening', 1),
-            ('opposition_opening', 'opposition', 'opening', 2),
-            ('proposition_rebuttal', 'proposition', 'rebuttal', 3),
-            ('opposition_rebuttal', 'opposition', 'rebuttal', 4),
-            ('proposition_closing', 'proposition', 'closing', 5),
-            ('opposition_closing', 'opposition', 'closing', 6),
-        ]
+                return ''.join(parts)
 
-        for stage, side, stage_name, order in speech_order:
-            text = debate_content[stage]
+            # Speeches that were not streamed (or came from the semantic cache) go to TTS here
+            def on_speech(stage: str, text: str) -> None:
+                if stage not in tts_futures:
+                    tts_futures[stage] = executor.submit(self._synthesize, stage, text)
 
-            # Generate filename
-            filename = self.config['output']['filename_pattern'].format(
-                order=order,
-                side=side,
-                stage=stage_name
-            )
-            output_path = self.output_dir / filename
+            speech_fn = speak_streaming if self._audio_gen.supports_text_streaming else None
+            debate_content = self.generate_debate(on_speech=on_speech, speech_fn=speech_fn)
 
-            # Generate audio
-            audio_gen.text_to_speech(
-                text=text,
-                output_path=str(output_path),
-                voice=side
-            )
+            audio_files = [tts_futures[stage].result() for stage, _, _, _ in SPEECH_ORDER]
+
+        return debate_content, audio_files
+
+    def _synthesize(self, stage: str, text: str) -> str:
+        """
+        Generate audio (and optionally a transcript) for a single speech.
+
+        Args:
+            stage: The debate stage (e.g., 'proposition_opening')
+            text: Speech text
+
+        Returns:
+            Path to the generated audio file
+        """
+        output_path = self._output_path(stage)
+        side = self._speech_info(stage)[1]
+
+        # Generate audio
+        self._audio_gen.text_to_speech(
+            text=text,
+            output_path=str(output_path),
+            voice=side
+        )
 
-            audio_files.append(str(output_path))
+        self._finish_audio(stage, text, output_path)
 
-            # Optionally save transcript
-            if self.config['output']['metadata']['include_transcript']:
-                transcript_path = output_path.with_suffix('.txt')
-                with open(transcript_path, 'w') as f:
-                    f.write(f"# {side.upper()} - {stage_name.upper()}\\n\\n")
-                    f.write(f"Motion: {self.motion}\\n\\n")
-                    f.write(text)
+        return str(output_path)
+
+    def _synthesize_stream(self, stage: str, text_chunks: Iterator[str]) -> str:
+        """
+        Generate audio (and optionally a transcript) from a speech as it streams in.
 
-        return audio_files
+        Args:
+            stage: The debate stage (e.g., 'proposition_opening')
+            text_chunks: Iterator of speech text fragments
+
+        Returns:
+            Path to the generated audio file
+        """
+        output_path = self._output_path(stage)
+        side = self._speech_info(stage)[1]
+
+        text = self._audio_gen.text_to_speech_stream(
+            text_chunks=text_chunks,
+            output_path=str(output_path),
+            voice=side
+        )
+
+        self._finish_audio(stage, text, output_path)
+
+        return str(output_path)
+
+    def _finish_audio(self, stage: str, text: str, output_path: Path) -> None:
+        """Post-process a generated audio file and write its transcript."""
+        # Optionally normalize loudness
+        if self.config['audio'].get('normalize', False):
+            self._audio_gen.normalize_audio(str(output_path))
+
+        self._write_transcript(stage, text, output_path)
+
+    def _speech_info(self, stage: str) -> Tuple[str, str, str, int]:
+        """Look up (stage, side, stage name, position) for a stage."""
+        return next(entry for entry in SPEECH_ORDER if entry[0] == stage)
+
+    def _output_path(self, stage: str) -> Path:
+        """Build the audio file path for a stage."""
+        _, side, stage_name, order = self._speech_info(stage)
+
+        filename = self.config['output']['filename_pattern'].format(
+            order=order,
+            side=side,
+            stage=stage_name
+        )
+        return self.output_dir / filename
+
+    def _write_transcript(self, stage: str, text: str, output_path: Path) -> None:
+        """Optionally save the transcript next to the audio file."""
+        if not self.config['output']['metadata']['include_transcript']:
+            return
+
+        _, side, stage_name, _ = self._speech_info(stage)
+
+        # Build the whole transcript so it is written with a single call
+        output_path.with_suffix('.txt').write_text(
+            f"# {side.upper()} - {stage_name.upper()}\n\nMotion: {self.debate_motion}\n\n{text}",
+            encoding='utf-8'
+        )
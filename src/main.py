@@ -5,20 +5,15 @@ Oxford Debate Agent - Main Entry Point
 Generates a complete Oxford-style debate with audio output.
 """
 
+import functools
 import os
 from pathlib import Path
 from typing import Optional
 
 import typer
-from dotenv import load_dotenv
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from debate_orchestrator import DebateOrchestrator
-
-# Load environment variables (optional, API key loaded from config/secrets/config.json)
-load_dotenv()
-
 app = typer.Typer(
     help="🎭 Oxford Debate Agent - Generate AI-powered debates with audio output",
     add_completion=False
@@ -26,6 +21,14 @@ app = typer.Typer(
 console = Console()
 
 
+@functools.cache
+def load_environment():
+    """Load environment variables (optional, API key loaded from config/secrets/config.json)."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
 def check_config():
     """Verify that API configuration exists."""
     config_path = Path("config/secrets/config.json")
@@ -58,6 +61,16 @@ def generate(
         "-c",
         help="Path to configuration file"
     ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Bypass the LLM response cache and the semantic debate cache"
+    ),
+    hd: Optional[bool] = typer.Option(
+        None,
+        "--hd/--no-hd",
+        help="Use the high-quality (slower) tts-1-hd model instead of tts-1"
+    ),
 ):
     """
     Generate an Oxford-style debate with audio output.
@@ -72,6 +85,10 @@ def generate(
     # Check for API configuration
     check_config()
 
+    # Deferred so commands like `examples` never pay for the LLM/TTS stack imports
+    load_environment()
+    from debate_orchestrator import DebateOrchestrator
+
     console.print(f"[yellow]Motion:[/yellow] {motion}\n")
 
     # Initialize orchestrator (will load API key from config/secrets/config.json)
@@ -79,28 +96,33 @@ def generate(
         orchestrator = DebateOrchestrator(
             motion=motion,
             config_path=config_path,
-            output_dir=output_dir
+            output_dir=output_dir,
+            use_cache=not no_cache,
+            tts_model=None if hd is None else ('tts-1-hd' if hd else 'tts-1')
         )
     except Exception as e:
         console.print(f"[bold red]Error initializing orchestrator:[/bold red] {e}")
         raise typer.Exit(1)
 
-    # Generate debate
-    with Progress(
+    # Only animate the spinner on a terminal; redirected output gets plain status lines
+    interactive = console.is_terminal
+
+    # Generate debate (closing the orchestrator's caches afterwards)
+    with orchestrator, Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         console=console,
+        disable=not interactive,
     ) as progress:
 
-        task = progress.add_task("[cyan]Generating debate...", total=None)
+        task = progress.add_task("[cyan]Generating debate and audio...", total=None)
+        if not interactive:
+            console.print("Generating debate and audio...")
 
         try:
-            debate_content = orchestrator.generate_debate()
-            progress.update(task, description="[green]✓ Debate content generated")
-
-            progress.update(task, description="[cyan]Generating audio files...")
-            audio_files = orchestrator.generate_audio(debate_content)
-            progress.update(task, description="[green]✓ Audio files generated")
+            # Audio for each speech is generated while later speeches are written
+            debate_content, audio_files = orchestrator.generate_debate_with_audio()
+            progress.update(task, description="[green]✓ Debate content and audio files generated")
 
         except Exception as e:
             console.print(f"\n[bold red]Error during generation:[/bold red] {e}")
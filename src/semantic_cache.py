@@ -0,0 +1,157 @@
+"""
+Semantic Debate Cache
+
+Reuses previously generated debate text for motions that are near-paraphrases
+of one another, using embedding similarity. Only the speech text is cached;
+audio is still synthesized for every run.
+"""
+
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import orjson
+from openai import OpenAI
+
+
+class SemanticDebateCache:
+    """Caches debate content keyed by the embedding of the motion."""
+
+    EMBEDDING_MODEL = "text-embedding-3-small"
+    EMBEDDING_DIM = 1536
+
+    def __init__(
+        self,
+        directory: str,
+        threshold: float = 0.93,
+        client: Optional[OpenAI] = None,
+        model: str = "",
+        prompts_hash: str = ""
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            directory: Directory holding the persisted index
+            threshold: Minimum cosine similarity for a cache hit
+            client: OpenAI client used for embeddings
+            model: LLM model the debates are generated with
+            prompts_hash: Hash of the speech prompts the debates are generated with
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.client = client or OpenAI()
+        self.model = model
+        self.prompts_hash = prompts_hash
+
+        # Embeddings and debates live in one file so they are replaced together
+        self.index_path = self.directory / "index.npz"
+
+        self.embeddings, self.debates = self._load()
+
+    def _load(self) -> Tuple[np.ndarray, List[Dict]]:
+        """Load the persisted index, discarding it if unreadable or inconsistent."""
+        empty = (np.empty((0, self.EMBEDDING_DIM), dtype=np.float32), [])
+
+        if not self.index_path.exists():
+            return empty
+
+        try:
+            with np.load(self.index_path) as data:
+                embeddings = data['embeddings']
+                debates: List[Dict] = orjson.loads(data['debates'].tobytes())
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            return empty
+
+        # Every debate must have exactly one embedding row
+        if embeddings.ndim != 2 or embeddings.shape[0] != len(debates):
+            return empty
+
+        return embeddings, debates
+
+    def _save(self) -> None:
+        """Persist the index atomically via a temporary file."""
+        fd, tmp_path = tempfile.mkstemp(suffix='.npz', dir=self.directory)
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(
+                    f,
+                    embeddings=self.embeddings,
+                    debates=np.frombuffer(orjson.dumps(self.debates), dtype=np.uint8)
+                )
+            os.replace(tmp_path, self.index_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def embed(self, motion: str) -> np.ndarray:
+        """
+        Embed a motion.
+
+        Args:
+            motion: The debate motion
+
+        Returns:
+            Unit-normalized embedding vector
+        """
+        response = self.client.embeddings.create(
+            model=self.EMBEDDING_MODEL,
+            input=motion
+        )
+        embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
+        return embedding / np.linalg.norm(embedding)
+
+    def lookup(self, embedding: np.ndarray) -> Optional[Dict]:
+        """
+        Find a cached debate for a similar motion.
+
+        Args:
+            embedding: Embedding of the motion
+
+        Returns:
+            Cached entry with the original 'motion' and its 'debate_content',
+            or None if no motion is similar enough
+        """
+        if not self.debates:
+            return None
+
+        # Stored embeddings are unit-normalized, so the dot product is cosine similarity
+        scores = self.embeddings @ embedding
+
+        # Ignore debates generated with a different model or different prompts
+        stale = np.array([
+            debate.get('model') != self.model or debate.get('prompts_hash') != self.prompts_hash
+            for debate in self.debates
+        ])
+        scores[stale] = -np.inf
+
+        best = int(np.argmax(scores))
+
+        if scores[best] < self.threshold:
+            return None
+
+        return self.debates[best]
+
+    def add(self, embedding: np.ndarray, motion: str, debate_content: Dict[str, str]) -> None:
+        """
+        Store debate content and persist the index.
+
+        Args:
+            embedding: Embedding of the motion
+            motion: The debate motion
+            debate_content: Dictionary of stage -> text
+        """
+        self.embeddings = np.vstack([self.embeddings, embedding[np.newaxis, :]])
+        self.debates.append({
+            'motion': motion,
+            'model': self.model,
+            'prompts_hash': self.prompts_hash,
+            'debate_content': dict(debate_content),
+        })
+
+        self._save()